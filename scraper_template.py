@@ -12,6 +12,7 @@ import requests
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 from pathlib import Path
+from change_probe import load_probes, load_max_staleness, check_for_changes, record_scrape
 
 load_dotenv(Path(__file__).parent/'.env')
 
@@ -22,6 +23,9 @@ CONFIG = {
     'DISCORD_WEBHOOK': os.getenv('DISCORD_WEBHOOK_URL'),
     'DISCORD_AVATAR': os.getenv('DISCORD_AVATAR_URL', '')
 }
+PROBE_STATE_PATH = './job_listings/COMPANY_NAME_probe.json'
+PROBES = load_probes('COMPANY')
+MAX_STALENESS_HOURS = load_max_staleness('COMPANY')
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -51,7 +55,7 @@ def validate_url(url):
     except:
         return False
 
-def scrape_with_selenium():
+def scrape_with_selenium(claim_new_jobs=None, mark_notified=None):
     driver = None
     try:
         driver = setup_driver()
@@ -104,9 +108,13 @@ def scrape_with_selenium():
             }
             
             new_jobs = compare_jobs(job_data, job_links_dict)
+            if claim_new_jobs:
+                new_jobs = claim_new_jobs(job_links_dict, new_jobs)
         
             if new_jobs:
-                send_discord_notification(new_jobs)
+                notified = send_discord_notification(new_jobs)
+                if notified and mark_notified:
+                    mark_notified(new_jobs)
 
             today_entry = {
                 "date": current_date,
@@ -129,7 +137,7 @@ def scrape_with_selenium():
 
 def send_discord_notification(new_jobs):
     if not new_jobs:
-        return
+        return False
     
     # Customize this message format as needed
     message = "🚀 **New Job Postings Detected!**\n\n"
@@ -146,8 +154,10 @@ def send_discord_notification(new_jobs):
         response = requests.post(CONFIG['DISCORD_WEBHOOK'], json=payload)
         response.raise_for_status()
         logging.info("Discord notification sent successfully")
+        return True
     except Exception as e:
         logging.error(f"Failed to send Discord notification: {e}")
+        return False
         
 def compare_jobs(previous_jobs, current_jobs):
     if not previous_jobs:
@@ -162,13 +172,24 @@ def compare_jobs(previous_jobs, current_jobs):
     
     return new_jobs
 
+def main(claim_new_jobs=None, mark_notified=None):
+    changed, signatures = check_for_changes(PROBE_STATE_PATH, PROBES, MAX_STALENESS_HOURS)
+    if not changed:
+        logging.info("No change detected by probes, skipping scrape")
+        return True
+
+    html_content = scrape_with_selenium(claim_new_jobs, mark_notified)
+    if not html_content:
+        logging.error("Scraping failed!")
+        return False
+
+    record_scrape(PROBE_STATE_PATH, signatures)
+    logging.info("Scraping completed successfully!")
+    return True
+
 if __name__ == "__main__":
     try:
-        html_content = scrape_with_selenium()
-        if html_content:
-            logging.info("Scraping completed successfully!")
-        else:
-            logging.error("Scraping failed!")
+        main()
             
     except Exception as e:
         logging.error(f"Fatal error in main: {e}", exc_info=True)
\ No newline at end of file
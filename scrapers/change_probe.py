@@ -0,0 +1,189 @@
+import logging
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+import requests
+
+PROBE_TIMEOUT = 15
+DEFAULT_MAX_STALENESS_HOURS = 24
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+ATS_ID_FIELDS = ['id', 'shortcode', 'absolute_url', 'hostedUrl', 'url']
+
+
+def load_probes(prefix):
+    # Probes are configured per site in .env, e.g. FLARE_PROBE_ATS_URL=...
+    probes = []
+    for probe_type in ['head', 'sitemap', 'feed', 'ats']:
+        url = os.getenv(f"{prefix}_PROBE_{probe_type.upper()}_URL")
+        if not url:
+            continue
+        probe = {'type': probe_type, 'url': url}
+        if probe_type == 'sitemap':
+            probe['match'] = os.getenv(f"{prefix}_PROBE_SITEMAP_MATCH", '')
+        if probe_type == 'ats':
+            probe['key'] = os.getenv(f"{prefix}_PROBE_ATS_KEY", 'jobs')
+            probe['count_key'] = os.getenv(f"{prefix}_PROBE_ATS_COUNT_KEY", '')
+        probes.append(probe)
+    return probes
+
+
+def load_max_staleness(prefix):
+    value = os.getenv(f"{prefix}_MAX_STALENESS_HOURS")
+    try:
+        return float(value) if value else DEFAULT_MAX_STALENESS_HOURS
+    except ValueError:
+        logging.warning(f"Invalid {prefix}_MAX_STALENESS_HOURS: {value}, using default")
+        return DEFAULT_MAX_STALENESS_HOURS
+
+
+def fingerprint(values):
+    return hashlib.sha256("\n".join(values).encode('utf-8')).hexdigest()
+
+
+def local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def probe_head(probe):
+    response = requests.head(probe['url'], allow_redirects=True, timeout=PROBE_TIMEOUT)
+    response.raise_for_status()
+    headers = [response.headers.get(name, '') for name in ['ETag', 'Last-Modified', 'Content-Length']]
+    if not any(headers):
+        return None
+    return "|".join(headers)
+
+
+def probe_sitemap(probe):
+    response = requests.get(probe['url'], timeout=PROBE_TIMEOUT)
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+
+    entries = []
+    for url_element in root:
+        fields = {local_name(child.tag): (child.text or '').strip() for child in url_element}
+        loc = fields.get('loc', '')
+        if probe.get('match') and probe['match'] not in loc:
+            continue
+        entries.append(f"{loc} {fields.get('lastmod', '')}")
+    # No matching URLs means a wrong match or an unexpected document, not an empty board
+    if not entries:
+        return None
+    return fingerprint(sorted(entries))
+
+
+def probe_feed(probe):
+    response = requests.get(probe['url'], timeout=PROBE_TIMEOUT)
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+
+    entries = []
+    for element in root.iter():
+        # RSS uses <item>, Atom uses <entry>
+        if local_name(element.tag) not in ['item', 'entry']:
+            continue
+        fields = {}
+        for child in element:
+            name = local_name(child.tag)
+            fields[name] = (child.text or child.get('href') or '').strip()
+        identity = fields.get('guid') or fields.get('id') or fields.get('link', '')
+        updated = fields.get('updated') or fields.get('pubDate', '')
+        entries.append(f"{identity} {updated}")
+    if not entries:
+        return None
+    return fingerprint(sorted(entries))
+
+
+def probe_ats(probe):
+    response = requests.get(probe['url'], timeout=PROBE_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+
+    # Count endpoints, e.g. {"count": 3}, only expose the number of open jobs
+    if probe.get('count_key'):
+        if not isinstance(data, dict):
+            return None
+        try:
+            return str(int(data[probe['count_key']]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    if isinstance(data, list):
+        items = data
+    elif isinstance(data, dict):
+        items = data.get(probe.get('key', 'jobs'))
+    else:
+        return None
+    if not isinstance(items, list):
+        return None
+    ids = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for field in ATS_ID_FIELDS:
+            if item.get(field):
+                ids.append(str(item[field]))
+                break
+    # Fall back to the bare count when the endpoint exposes no job identifiers
+    return f"{len(items)}:{fingerprint(sorted(ids))}"
+
+
+PROBE_TYPES = {
+    'head': probe_head,
+    'sitemap': probe_sitemap,
+    'feed': probe_feed,
+    'ats': probe_ats,
+}
+
+
+def load_probe_state(state_path):
+    if os.path.exists(state_path) and os.path.getsize(state_path) > 0:
+        try:
+            with open(state_path, 'r') as file:
+                return json.load(file)
+        except json.JSONDecodeError:
+            logging.warning("Existing probe state was corrupted, starting fresh")
+    return {}
+
+
+def check_for_changes(state_path, probes, max_staleness_hours=DEFAULT_MAX_STALENESS_HOURS):
+    """Return (changed, signatures); changed is True when a full scrape is needed."""
+    if not probes:
+        return True, {}
+
+    state = load_probe_state(state_path)
+    last_scrape = state.get('last_scrape')
+    try:
+        age = datetime.now() - datetime.strptime(last_scrape, DATE_FORMAT)
+        changed = age > timedelta(hours=max_staleness_hours)
+    except (TypeError, ValueError):
+        if last_scrape:
+            logging.warning("Existing probe state has an invalid last_scrape, starting fresh")
+        changed = True
+
+    previous = state.get('signatures', {})
+    signatures = {}
+    for probe in probes:
+        key = f"{probe['type']}:{probe['url']}"
+        try:
+            signature = PROBE_TYPES[probe['type']](probe)
+        except Exception as e:
+            logging.warning(f"Probe {key} failed: {e}")
+            signature = None
+
+        # A probe that cannot give an answer never vetoes a scrape
+        if signature is None or signature != previous.get(key):
+            changed = True
+        signatures[key] = signature
+
+    return changed, signatures
+
+
+def record_scrape(state_path, signatures):
+    state = {
+        "last_scrape": datetime.now().strftime(DATE_FORMAT),
+        "signatures": signatures
+    }
+    with open(state_path, 'w') as file:
+        json.dump(state, file, indent=4)
@@ -0,0 +1,244 @@
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class LeaseLost(Exception):
+    pass
+
+
+@dataclass
+class Lease:
+    site: str
+    worker_id: str
+    token: int
+    expires: float
+
+
+class WorkQueue(ABC):
+    """Interface for site work queues shared between workers.
+
+    A lease is only valid while its token matches the one stored by the
+    backend, so a worker whose lease expired cannot claim or mark new jobs
+    after another worker picked the site up again.
+    """
+
+    @abstractmethod
+    def enqueue(self, sites):
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id, lease_seconds):
+        pass
+
+    @abstractmethod
+    def heartbeat(self, lease, lease_seconds):
+        pass
+
+    @abstractmethod
+    def complete(self, lease):
+        pass
+
+    @abstractmethod
+    def fail(self, lease, retry_delay):
+        pass
+
+    @abstractmethod
+    def claim_new_jobs(self, lease, current_jobs, new_jobs):
+        pass
+
+    @abstractmethod
+    def mark_notified(self, lease, jobs):
+        pass
+
+
+class SQLiteWorkQueue(WorkQueue):
+    def __init__(self, path, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sites (
+                    site TEXT PRIMARY KEY,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    available_at REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_token INTEGER NOT NULL DEFAULT 0,
+                    lease_expires REAL NOT NULL DEFAULT 0
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen_jobs (
+                    site TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    url TEXT,
+                    first_seen TEXT NOT NULL,
+                    worker_id TEXT NOT NULL,
+                    notified_at TEXT,
+                    PRIMARY KEY (site, title)
+                )""")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(seen_jobs)")]
+            if 'notified_at' not in columns:
+                # Queues created before notifications were tracked have already announced their jobs
+                conn.execute("ALTER TABLE seen_jobs ADD COLUMN notified_at TEXT")
+                conn.execute("UPDATE seen_jobs SET notified_at = first_seen")
+
+    @contextmanager
+    def _transaction(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # IMMEDIATE takes the write lock up front so two workers never lease the same row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _holds_lease(self, conn, lease, now):
+        row = conn.execute(
+            "SELECT state, lease_owner, lease_token, lease_expires FROM sites WHERE site = ?",
+            (lease.site,)
+        ).fetchone()
+        return (
+            row is not None
+            and row[0] == 'leased'
+            and row[1] == lease.worker_id
+            and row[2] == lease.token
+            and row[3] >= now
+        )
+
+    def enqueue(self, sites):
+        now = time.time()
+        with self._transaction() as conn:
+            for site in sites:
+                # Sites currently leased keep their lease, everything else is reset
+                conn.execute("""
+                    INSERT INTO sites (site, state, available_at) VALUES (?, 'pending', ?)
+                    ON CONFLICT(site) DO UPDATE SET state = 'pending', available_at = excluded.available_at, attempts = 0
+                    WHERE state != 'leased' OR lease_expires < excluded.available_at
+                """, (site, now))
+
+    def lease(self, worker_id, lease_seconds):
+        now = time.time()
+        with self._transaction() as conn:
+            # Workers that crashed on their last allowed attempt never call fail()
+            exhausted = conn.execute("""
+                SELECT site FROM sites
+                WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+            """, (now, self.max_attempts)).fetchall()
+            for (site,) in exhausted:
+                logging.error(f"Site {site} failed {self.max_attempts} times, marking it as failed")
+                conn.execute("UPDATE sites SET state = 'failed', lease_owner = NULL WHERE site = ?", (site,))
+
+            row = conn.execute("""
+                SELECT site, lease_token FROM sites
+                WHERE attempts < ?
+                  AND ((state = 'pending' AND available_at <= ?)
+                       OR (state = 'leased' AND lease_expires < ?))
+                ORDER BY available_at
+                LIMIT 1
+            """, (self.max_attempts, now, now)).fetchone()
+            if row is None:
+                return None
+
+            site, token = row[0], row[1] + 1
+            expires = now + lease_seconds
+            conn.execute("""
+                UPDATE sites SET state = 'leased', lease_owner = ?, lease_token = ?,
+                    lease_expires = ?, attempts = attempts + 1
+                WHERE site = ?
+            """, (worker_id, token, expires, site))
+            return Lease(site, worker_id, token, expires)
+
+    def heartbeat(self, lease, lease_seconds):
+        now = time.time()
+        with self._transaction() as conn:
+            if not self._holds_lease(conn, lease, now):
+                return False
+            lease.expires = now + lease_seconds
+            conn.execute("UPDATE sites SET lease_expires = ? WHERE site = ?", (lease.expires, lease.site))
+            return True
+
+    def complete(self, lease):
+        with self._transaction() as conn:
+            if not self._holds_lease(conn, lease, time.time()):
+                logging.warning(f"Lease on {lease.site} was lost before completion")
+                return False
+            conn.execute(
+                "UPDATE sites SET state = 'done', lease_owner = NULL, attempts = 0 WHERE site = ?",
+                (lease.site,)
+            )
+            return True
+
+    def fail(self, lease, retry_delay):
+        now = time.time()
+        with self._transaction() as conn:
+            if not self._holds_lease(conn, lease, now):
+                return False
+            conn.execute("""
+                UPDATE sites SET
+                    state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    available_at = ?, lease_owner = NULL
+                WHERE site = ?
+            """, (self.max_attempts, now + retry_delay, lease.site))
+            return True
+
+    def claim_new_jobs(self, lease, current_jobs, new_jobs):
+        current_date = datetime.now().strftime(DATE_FORMAT)
+        with self._transaction() as conn:
+            if not self._holds_lease(conn, lease, time.time()):
+                raise LeaseLost(f"Lease on {lease.site} expired or was taken over")
+
+            # Jobs that left the board are forgotten so a later repost is announced
+            # again, matching compare_jobs() against the latest snapshot
+            seen = conn.execute("SELECT title FROM seen_jobs WHERE site = ?", (lease.site,)).fetchall()
+            for (title,) in seen:
+                if title not in current_jobs:
+                    conn.execute("DELETE FROM seen_jobs WHERE site = ? AND title = ?", (lease.site, title))
+
+            # Every current job is recorded so that a worker with an older local
+            # history does not notify jobs another worker has already seen
+            for title, url in current_jobs.items():
+                conn.execute("""
+                    INSERT OR IGNORE INTO seen_jobs (site, title, url, first_seen, worker_id, notified_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (lease.site, title, url, current_date, lease.worker_id,
+                      None if title in new_jobs else current_date))
+
+            # Also returns jobs claimed earlier whose notification never went out
+            pending = conn.execute(
+                "SELECT title, url FROM seen_jobs WHERE site = ? AND notified_at IS NULL",
+                (lease.site,)
+            ).fetchall()
+            return {title: url for title, url in pending}
+
+    def mark_notified(self, lease, jobs):
+        current_date = datetime.now().strftime(DATE_FORMAT)
+        with self._transaction() as conn:
+            if not self._holds_lease(conn, lease, time.time()):
+                raise LeaseLost(f"Lease on {lease.site} expired or was taken over")
+            for title in jobs:
+                conn.execute(
+                    "UPDATE seen_jobs SET notified_at = ? WHERE site = ? AND title = ?",
+                    (current_date, lease.site, title)
+                )
+
+
+def open_queue(url):
+    if url.startswith('sqlite:///'):
+        return SQLiteWorkQueue(url[len('sqlite:///'):])
+    if '://' not in url:
+        return SQLiteWorkQueue(url)
+    raise ValueError(f"Unsupported work queue backend: {url}")
@@ -0,0 +1,100 @@
+import logging
+import argparse
+import importlib
+import os
+import socket
+import threading
+import time
+from dotenv import load_dotenv
+from pathlib import Path
+from work_queue import open_queue
+
+load_dotenv(Path(__file__).parent/'.env')
+
+DEFAULT_QUEUE = os.getenv('WORK_QUEUE_URL', './work_queue.db')
+LEASE_SECONDS = 300
+RETRY_DELAY_SECONDS = 600
+POLL_INTERVAL_SECONDS = 30
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+class Heartbeat(threading.Thread):
+    def __init__(self, queue, lease, lease_seconds):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.lease = lease
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.heartbeat(self.lease, self.lease_seconds):
+                    logging.warning(f"Lost lease on {self.lease.site}")
+                    return
+            except Exception as e:
+                logging.error(f"Heartbeat for {self.lease.site} failed: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+def run_site(queue, lease):
+    scraper = importlib.import_module(f"scraper_{lease.site}")
+    return scraper.main(
+        claim_new_jobs=lambda current_jobs, new_jobs: queue.claim_new_jobs(lease, current_jobs, new_jobs),
+        mark_notified=lambda jobs: queue.mark_notified(lease, jobs)
+    )
+
+def work(queue, worker_id, lease_seconds, poll):
+    while True:
+        lease = queue.lease(worker_id, lease_seconds)
+        if lease is None:
+            if not poll:
+                return
+            time.sleep(POLL_INTERVAL_SECONDS)
+            continue
+
+        heartbeat = Heartbeat(queue, lease, lease_seconds)
+        heartbeat.start()
+        try:
+            succeeded = run_site(queue, lease)
+        except Exception as e:
+            logging.error(f"Worker failed on {lease.site}: {e}", exc_info=True)
+            succeeded = False
+        finally:
+            heartbeat.stop()
+
+        if succeeded:
+            queue.complete(lease)
+        else:
+            queue.fail(lease, RETRY_DELAY_SECONDS)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run scrapers from a shared site work queue")
+    parser.add_argument('--queue', default=DEFAULT_QUEUE, help="Queue location, e.g. sqlite:///path/to/queue.db")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="Schedule sites for scraping")
+    enqueue_parser.add_argument('sites', nargs='+', help="Site names, e.g. flare for scraper_flare.py")
+
+    work_parser = subparsers.add_parser('work', help="Lease and scrape sites until the queue is empty")
+    work_parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}")
+    work_parser.add_argument('--lease-seconds', type=int, default=LEASE_SECONDS)
+    work_parser.add_argument('--poll', action='store_true', help="Keep waiting for new sites instead of exiting")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    try:
+        args = parse_args()
+        queue = open_queue(args.queue)
+        if args.command == 'enqueue':
+            queue.enqueue(args.sites)
+        else:
+            work(queue, args.worker_id, args.lease_seconds, args.poll)
+
+    except Exception as e:
+        logging.error(f"Fatal error in main: {e}", exc_info=True)
@@ -0,0 +1,194 @@
+import sys
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scrapers'))
+
+import change_probe
+from change_probe import check_for_changes, record_scrape, probe_sitemap, probe_feed, probe_ats
+
+
+class FakeResponse:
+    def __init__(self, content=b'', headers=None, data=None):
+        self.content = content
+        self.headers = headers or {}
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    responses = {}
+    monkeypatch.setattr(change_probe.requests, 'get', lambda url, **kwargs: responses[url])
+    monkeypatch.setattr(change_probe.requests, 'head', lambda url, **kwargs: responses[url])
+    return responses
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'site_probe.json')
+
+
+ATS_PROBE = {'type': 'ats', 'url': 'https://ats/jobs', 'key': 'jobs'}
+
+
+def write_state(state_path, last_scrape, signatures):
+    with open(state_path, 'w') as file:
+        json.dump({"last_scrape": last_scrape, "signatures": signatures}, file)
+
+
+def test_unchanged_and_fresh_skips_scrape(responses, state_path):
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'id': 1}]})
+    changed, signatures = check_for_changes(state_path, [ATS_PROBE])
+    assert changed
+    record_scrape(state_path, signatures)
+
+    assert check_for_changes(state_path, [ATS_PROBE]) == (False, signatures)
+
+
+def test_changed_signature_forces_scrape(responses, state_path):
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'id': 1}]})
+    record_scrape(state_path, check_for_changes(state_path, [ATS_PROBE])[1])
+
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'id': 2}]})
+
+    assert check_for_changes(state_path, [ATS_PROBE])[0]
+
+
+def test_stale_last_scrape_forces_scrape(responses, state_path):
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'id': 1}]})
+    signatures = check_for_changes(state_path, [ATS_PROBE])[1]
+    old = (datetime.now() - timedelta(hours=25)).strftime(change_probe.DATE_FORMAT)
+    write_state(state_path, old, signatures)
+
+    assert check_for_changes(state_path, [ATS_PROBE], max_staleness_hours=24)[0]
+    assert not check_for_changes(state_path, [ATS_PROBE], max_staleness_hours=48)[0]
+
+
+@pytest.mark.parametrize('content', [None, '{not json', '{"last_scrape": "garbage", "signatures": {}}'])
+def test_missing_or_corrupt_state_forces_scrape(responses, state_path, content):
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'id': 1}]})
+    if content is not None:
+        with open(state_path, 'w') as file:
+            file.write(content)
+
+    assert check_for_changes(state_path, [ATS_PROBE])[0]
+
+
+def test_probe_without_answer_always_forces_scrape(responses, state_path, monkeypatch):
+    monkeypatch.setitem(change_probe.PROBE_TYPES, 'head', lambda probe: None)
+    probes = [{'type': 'head', 'url': 'https://page'}]
+    record_scrape(state_path, check_for_changes(state_path, probes)[1])
+
+    assert check_for_changes(state_path, probes)[0]
+
+
+def test_failing_probe_always_forces_scrape(responses, state_path, monkeypatch):
+    def fail(probe):
+        raise ConnectionError("down")
+
+    monkeypatch.setitem(change_probe.PROBE_TYPES, 'head', fail)
+    probes = [{'type': 'head', 'url': 'https://page'}]
+    record_scrape(state_path, check_for_changes(state_path, probes)[1])
+
+    assert check_for_changes(state_path, probes)[0]
+
+
+SITEMAP = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>https://site/jobs/1</loc><lastmod>2025-07-01</lastmod></url>
+    <url><loc>https://site/about</loc><lastmod>2025-07-02</lastmod></url>
+</urlset>"""
+
+
+def test_probe_sitemap_only_fingerprints_matching_urls(responses):
+    responses['https://site/sitemap.xml'] = FakeResponse(SITEMAP)
+    probe = {'url': 'https://site/sitemap.xml', 'match': '/jobs/'}
+    signature = probe_sitemap(probe)
+
+    responses['https://site/sitemap.xml'] = FakeResponse(SITEMAP.replace(b'2025-07-02', b'2025-08-01'))
+    assert probe_sitemap(probe) == signature
+
+    responses['https://site/sitemap.xml'] = FakeResponse(SITEMAP.replace(b'2025-07-01', b'2025-08-01'))
+    assert probe_sitemap(probe) != signature
+
+
+def test_probe_sitemap_without_matches_returns_none(responses):
+    responses['https://site/sitemap.xml'] = FakeResponse(SITEMAP)
+
+    assert probe_sitemap({'url': 'https://site/sitemap.xml', 'match': '/careers/'}) is None
+
+
+RSS = b"""<rss><channel>
+    <item><guid>job-1</guid><pubDate>Tue, 01 Jul 2025</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<feed xmlns="http://www.w3.org/2005/Atom">
+    <entry><id>job-1</id><updated>2025-07-01</updated></entry>
+    <entry><link href="https://site/jobs/2"/><updated>2025-07-01</updated></entry>
+</feed>"""
+
+
+def test_probe_feed_reads_rss(responses):
+    responses['https://site/feed'] = FakeResponse(RSS)
+    signature = probe_feed({'url': 'https://site/feed'})
+
+    responses['https://site/feed'] = FakeResponse(RSS.replace(b'01 Jul', b'02 Jul'))
+    assert signature is not None
+    assert probe_feed({'url': 'https://site/feed'}) != signature
+
+
+def test_probe_feed_reads_atom(responses):
+    responses['https://site/feed'] = FakeResponse(ATOM)
+    signature = probe_feed({'url': 'https://site/feed'})
+
+    responses['https://site/feed'] = FakeResponse(ATOM.replace(b'jobs/2', b'jobs/3'))
+    assert signature is not None
+    assert probe_feed({'url': 'https://site/feed'}) != signature
+
+
+def test_probe_feed_without_entries_returns_none(responses):
+    responses['https://site/feed'] = FakeResponse(b'<html><body>Error</body></html>')
+
+    assert probe_feed({'url': 'https://site/feed'}) is None
+
+
+def test_probe_ats_reads_list_and_dict(responses):
+    responses['https://ats/list'] = FakeResponse(data=[{'id': 1}, {'id': 2}])
+    responses['https://ats/dict'] = FakeResponse(data={'result': [{'id': 2}, {'id': 1}]})
+
+    from_list = probe_ats({'url': 'https://ats/list'})
+    from_dict = probe_ats({'url': 'https://ats/dict', 'key': 'result'})
+
+    assert from_list == from_dict
+    assert from_list.startswith('2:')
+
+
+@pytest.mark.parametrize('data', [{'count': 3}, {'jobs': 5}, "jobs"])
+def test_probe_ats_without_job_list_returns_none(responses, data):
+    responses['https://ats/jobs'] = FakeResponse(data=data)
+
+    assert probe_ats({'url': 'https://ats/jobs', 'key': 'jobs'}) is None
+
+
+def test_probe_ats_count_key(responses):
+    responses['https://ats/count'] = FakeResponse(data={'count': 3})
+
+    assert probe_ats({'url': 'https://ats/count', 'count_key': 'count'}) == '3'
+    assert probe_ats({'url': 'https://ats/count', 'count_key': 'total'}) is None
+
+
+def test_probe_ats_without_ids_falls_back_to_count(responses):
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'title': 'A'}, {'title': 'B'}]})
+    signature = probe_ats({'url': 'https://ats/jobs', 'key': 'jobs'})
+
+    responses['https://ats/jobs'] = FakeResponse(data={'jobs': [{'title': 'A'}]})
+
+    assert signature.startswith('2:')
+    assert probe_ats({'url': 'https://ats/jobs', 'key': 'jobs'}) != signature
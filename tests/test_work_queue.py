@@ -0,0 +1,198 @@
+import sys
+import time
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scrapers'))
+
+import worker
+from work_queue import WorkQueue, SQLiteWorkQueue, LeaseLost
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteWorkQueue(str(tmp_path / 'work_queue.db'))
+
+
+def expire(lease):
+    time.sleep(max(lease.expires - time.time(), 0) + 0.01)
+
+
+def test_two_workers_never_lease_the_same_site(queue):
+    queue.enqueue(['flare', 'transit'])
+
+    first = queue.lease('worker-1', 60)
+    second = queue.lease('worker-2', 60)
+
+    assert {first.site, second.site} == {'flare', 'transit'}
+    assert queue.lease('worker-3', 60) is None
+
+
+def test_expired_lease_is_leased_again_with_higher_token(queue):
+    queue.enqueue(['flare'])
+    crashed = queue.lease('worker-1', 0.05)
+    expire(crashed)
+
+    lease = queue.lease('worker-2', 60)
+
+    assert lease.site == 'flare'
+    assert lease.token > crashed.token
+    assert not queue.heartbeat(crashed, 60)
+
+
+def test_claim_with_stale_lease_raises(queue):
+    queue.enqueue(['flare'])
+    crashed = queue.lease('worker-1', 0.05)
+    expire(crashed)
+    queue.lease('worker-2', 60)
+
+    with pytest.raises(LeaseLost):
+        queue.claim_new_jobs(crashed, {'Developer': 'https://a'}, {'Developer': 'https://a'})
+
+
+def test_second_claim_for_same_title_returns_nothing(queue):
+    jobs = {'Developer': 'https://a'}
+    queue.enqueue(['flare'])
+    first = queue.lease('worker-1', 60)
+    assert queue.claim_new_jobs(first, jobs, jobs) == jobs
+    queue.mark_notified(first, jobs)
+    assert queue.complete(first)
+
+    queue.enqueue(['flare'])
+    second = queue.lease('worker-2', 60)
+
+    assert queue.claim_new_jobs(second, jobs, jobs) == {}
+
+
+def test_enqueue_keeps_live_lease(queue):
+    queue.enqueue(['flare'])
+    lease = queue.lease('worker-1', 60)
+
+    queue.enqueue(['flare'])
+
+    assert queue.lease('worker-2', 60) is None
+    assert queue.heartbeat(lease, 60)
+
+
+def test_site_crashing_every_attempt_is_marked_failed(queue):
+    queue.enqueue(['flare'])
+    for attempt in range(queue.max_attempts):
+        crashed = queue.lease(f"worker-{attempt}", 0.05)
+        expire(crashed)
+
+    assert queue.lease('worker-next', 60) is None
+
+    queue.enqueue(['flare'])
+    assert queue.lease('worker-next', 60).site == 'flare'
+
+
+def test_site_failing_every_attempt_is_marked_failed(queue):
+    queue.enqueue(['flare'])
+    for attempt in range(queue.max_attempts):
+        lease = queue.lease(f"worker-{attempt}", 60)
+        assert queue.fail(lease, 0)
+
+    assert queue.lease('worker-next', 60) is None
+
+    queue.enqueue(['flare'])
+    assert queue.lease('worker-next', 60).site == 'flare'
+
+
+def test_claim_skips_jobs_that_are_not_new(queue):
+    queue.enqueue(['flare'])
+    lease = queue.lease('worker-1', 60)
+    current_jobs = {'Developer': 'https://a', 'Designer': 'https://b'}
+
+    assert queue.claim_new_jobs(lease, current_jobs, {'Designer': 'https://b'}) == {'Designer': 'https://b'}
+
+
+def test_unnotified_claim_is_returned_again(queue):
+    jobs = {'Developer': 'https://a'}
+    queue.enqueue(['flare'])
+    first = queue.lease('worker-1', 60)
+    assert queue.claim_new_jobs(first, jobs, jobs) == jobs
+    queue.fail(first, 0)
+
+    second = queue.lease('worker-2', 60)
+    assert queue.claim_new_jobs(second, jobs, {}) == jobs
+    queue.mark_notified(second, jobs)
+    assert queue.claim_new_jobs(second, jobs, {}) == {}
+
+
+def test_mark_notified_with_stale_lease_raises(queue):
+    jobs = {'Developer': 'https://a'}
+    queue.enqueue(['flare'])
+    crashed = queue.lease('worker-1', 0.05)
+    queue.claim_new_jobs(crashed, jobs, jobs)
+    expire(crashed)
+
+    with pytest.raises(LeaseLost):
+        queue.mark_notified(crashed, jobs)
+
+
+def test_reposted_job_is_claimed_again(queue):
+    developer = {'Developer': 'https://a'}
+    designer = {'Designer': 'https://b'}
+    queue.enqueue(['flare'])
+    lease = queue.lease('worker-1', 60)
+    queue.mark_notified(lease, queue.claim_new_jobs(lease, developer, developer))
+
+    queue.claim_new_jobs(lease, designer, designer)
+    queue.mark_notified(lease, designer)
+
+    assert queue.claim_new_jobs(lease, {**developer, **designer}, developer) == developer
+
+
+def test_backend_missing_a_method_cannot_be_created():
+    class PartialQueue(WorkQueue):
+        def enqueue(self, sites):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialQueue()
+
+
+def test_heartbeat_renews_lease_until_it_is_lost(queue):
+    queue.enqueue(['flare'])
+    lease = queue.lease('worker-1', 0.3)
+    heartbeat = worker.Heartbeat(queue, lease, 0.3)
+    heartbeat.start()
+
+    time.sleep(0.6)
+    assert heartbeat.is_alive()
+    assert queue.lease('worker-2', 60) is None
+
+    queue.fail(lease, 60)
+    heartbeat.join(timeout=1)
+    assert not heartbeat.is_alive()
+
+
+def test_work_completes_successful_sites(queue, monkeypatch):
+    monkeypatch.setattr(worker, 'run_site', lambda queue, lease: True)
+    queue.enqueue(['flare'])
+
+    worker.work(queue, 'worker-1', 60, False)
+
+    assert queue.lease('worker-2', 60) is None
+    queue.enqueue(['flare'])
+    assert queue.lease('worker-2', 60).site == 'flare'
+
+
+def test_work_retries_failed_sites_after_delay(queue, monkeypatch):
+    runs = []
+
+    def run_site(queue, lease):
+        runs.append(lease.site)
+        raise RuntimeError("chrome crashed")
+
+    monkeypatch.setattr(worker, 'run_site', run_site)
+    monkeypatch.setattr(worker, 'RETRY_DELAY_SECONDS', 0.2)
+    queue.enqueue(['flare'])
+
+    worker.work(queue, 'worker-1', 60, False)
+    assert runs == ['flare']
+    assert queue.lease('worker-2', 60) is None
+
+    time.sleep(0.3)
+    worker.work(queue, 'worker-1', 60, False)
+    assert runs == ['flare', 'flare']